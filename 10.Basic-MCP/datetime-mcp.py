@@ -7,7 +7,7 @@ mcp = FastMCP(name="Datetime-MCP")
 def get_current_datetime() -> str:
     """현재 날짜와 시간을 반환합니다."""
     now = datetime.now()
-    return now.strftime("%Y-%m-%d %H:%M:%S")
+    return now.isoformat(sep=" ", timespec="seconds")
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -1,15 +1,32 @@
+from functools import lru_cache
 import requests
+from requests.adapters import HTTPAdapter
 from fastmcp import FastMCP
 
 mcp = FastMCP("Weather-MCP", dependencies=["requests"])
 
+# HTTP keep-alive 재사용을 위한 공용 세션
+_session = requests.Session()
+_session.headers.update({"Accept": "application/json"})
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+_session.mount("https://api.open-meteo.com", _adapter)
+_session.mount("https://ipinfo.io", _adapter)
+
+# 프로세스 동안 IP가 거의 바뀌지 않으므로 성공한 조회 결과만 캐시
+@lru_cache(maxsize=1)
+def _lookup_lat_lon():
+    res = _session.get('https://ipinfo.io/json', timeout=5)
+    res.raise_for_status()
+    loc = res.json().get('loc')
+    # 오류 응답은 예외로 넘겨 기본값(서울)이 캐시되지 않도록 함
+    if not loc:
+        raise ValueError("ipinfo 응답에 loc 정보가 없습니다.")
+    latitude, longitude = map(float, loc.split(','))
+    return latitude, longitude
+
 def get_lat_lon_from_ip():
     try:
-        res = requests.get('https://ipinfo.io/json')
-        data = res.json()
-        loc = data.get('loc', '37.5665,126.9780')  # 기본값: 서울
-        latitude, longitude = map(float, loc.split(','))
-        return latitude, longitude
+        return _lookup_lat_lon()
     except Exception as e:
         print(f"위치 정보를 가져올 수 없습니다. 기본값(서울) 사용. 오류: {e}")
         return 37.5665, 126.9780  # 기본값: 서울
@@ -23,7 +40,7 @@ def get_weather():
     latitude, longitude = get_lat_lon_from_ip()
     url = f'https://api.open-meteo.com/v1/forecast?latitude={latitude}&longitude={longitude}&hourly=temperature_2m,relative_humidity_2m,dew_point_2m,weather_code&timezone=GMT&forecast_days=1'
     try:
-        response = requests.get(url)
+        response = _session.get(url, timeout=5)
         weather_data = response.json()
         return weather_data
     except Exception as e:
@@ -1,15 +1,127 @@
 from fastmcp import FastMCP
+import warnings
+import numpy as np
 import pandas as pd
-from typing import Annotated
+import pyarrow as pa
+from typing import Annotated, Dict, List, Optional
 from pydantic import Field
 
 # CSV 파일 경로
 _df_cache = {}
+# (id(df), group_column) -> DataFrameGroupBy 캐시
+_gb_cache = {}
+# (id(df), column, operation, condition_value) -> 필터 결과 행 인덱스 캐시
+_filter_cache = {}
+FILTER_CACHE_MAXSIZE = 256
 csv_path = "C:\\MCP_Test\\wikidocs-mcp\\Analytics-MCP\\data.csv"
-_df_cache["df"] = pd.read_csv(csv_path)
 
 # MCP 인스턴스 생성
-mcp = FastMCP(name="Analytics-MCP", dependencies=["pandas"])
+mcp = FastMCP(name="Analytics-MCP", dependencies=["pandas", "pyarrow"])
+
+# CSV를 읽어 캐시에 저장 (pyarrow 멀티스레드 파서 사용)
+# pyarrow 엔진에 dtype을 넘기면 결측치가 있는 정수 컬럼 변환이 실패하므로 타입은 읽은 뒤 지정
+def _read_csv(usecols=None, dtypes=None):
+    df = pd.read_csv(csv_path, engine="pyarrow", usecols=usecols)
+    if dtypes:
+        df = df.astype(dtypes)
+    _df_cache["df"] = df
+    _gb_cache.clear()
+    _filter_cache.clear()
+    return df
+
+# 첫 호출 시에만 CSV를 읽음
+def _get_df():
+    df = _df_cache.get("df")
+    if df is None:
+        df = _read_csv()
+    return df
+
+# 컬럼별 결측치 개수 (실수형은 np.isnan, 그 외는 pd.isna)
+def _count_missing(col):
+    values = col.values
+    if isinstance(values, np.ndarray) and values.dtype.kind in "fc":
+        return int(np.isnan(values).sum())
+    return int(pd.isna(values).sum())
+
+
+# 숫자형 컬럼은 np.unique로 값별 개수를 계산 (value_counts와 같이 NaN 제외, 개수 내림차순)
+def _value_counts(col):
+    values = col.values
+    if not isinstance(values, np.ndarray) or values.dtype.kind not in "iuf":
+        return col.value_counts()
+    if values.dtype.kind == "f":
+        values = values[~np.isnan(values)]
+    uniques, counts = np.unique(values, return_counts=True)
+    order = np.argsort(-counts, kind="stable")
+    return pd.Series(counts[order], index=pd.Index(uniques[order], name=col.name), name="count")
+
+
+# 숫자형 컬럼 요약 통계를 NumPy 한 번의 벡터 연산으로 계산 (df.describe()와 같은 형태)
+DESCRIBE_INDEX = ["count", "mean", "std", "min", "25%", "50%", "75%", "max"]
+
+def _describe(df):
+    numeric = df.select_dtypes("number")
+    if numeric.shape[1] == 0 or numeric.shape[0] == 0:
+        return df.describe()
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    with warnings.catch_warnings():
+        # 전부 NaN인 컬럼은 pandas와 같이 NaN으로 남김
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stats = np.vstack([
+            (~np.isnan(values)).sum(axis=0),
+            np.nanmean(values, axis=0),
+            np.nanstd(values, axis=0, ddof=1),
+            np.nanmin(values, axis=0),
+            np.nanpercentile(values, [25, 50, 75], axis=0),
+            np.nanmax(values, axis=0),
+        ])
+    return pd.DataFrame(stats, index=DESCRIBE_INDEX, columns=numeric.columns)
+
+
+# pandas 결과를 Arrow를 거쳐 JSON 직렬화 가능한 행 리스트로 변환
+# index=True면 인덱스를 항상 컬럼으로 포함 (집계 결과), False면 항상 제외 (원본 행 결과)
+def _to_json(obj, index=True):
+    if isinstance(obj, pd.Series):
+        # 값 이름이 인덱스 이름과 겹치면 (예: 같은 컬럼으로 groupby 후 count) "value"로 대체
+        name = obj.name if obj.name is not None and obj.name not in obj.index.names else "value"
+        obj = obj.to_frame(name)
+    if isinstance(obj, pd.DataFrame):
+        if index:
+            obj = obj.rename_axis([
+                f"{n}_index" if n is not None and n in obj.columns else n for n in obj.index.names
+            ]).reset_index()
+        try:
+            return pa.Table.from_pandas(obj, preserve_index=False).to_pylist()
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            # 숫자 컬럼이 없을 때의 describe()처럼 한 컬럼에 여러 타입이 섞이면 문자열로 변환
+            mixed = obj.select_dtypes("object").columns
+            obj = obj.astype({c: "string" for c in mixed})
+            return pa.Table.from_pandas(obj, preserve_index=False).to_pylist()
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    return obj
+
+
+# 필요한 컬럼/타입만 지정해 CSV를 다시 읽는 함수
+@mcp.tool(
+    name="load_csv",
+    description="Reload the CSV into the cache, optionally with only the given columns and explicit dtypes. Use 'category' for columns that will be grouped on."
+)
+def load_csv(
+    usecols: Annotated[Optional[List[str]], Field(description="Columns to load. All columns are loaded if omitted.")] = None,
+    dtypes: Annotated[Optional[Dict[str, str]], Field(description="Mapping of column name to dtype (e.g. category, int64, float64, string).")] = None
+):
+    """
+    Args:
+        usecols (List[str], optional): Columns to load
+        dtypes (Dict[str, str], optional): Mapping of column name to dtype
+
+    Returns:
+        The dtypes of the reloaded DataFrame.
+    """
+    df = _read_csv(usecols=usecols, dtypes=dtypes)
+    return _to_json(df.dtypes.astype(str))
+
 
 # DataFrame을 캐시에서 불러오는 함수
 @mcp.tool(
@@ -22,11 +134,9 @@ def load_df():
         None
 
     Returns:
-        The DataFrame loaded from the cache.
+        The cached DataFrame as a list of row dicts.
     """
-    if "df" not in _df_cache:
-        raise ValueError("No DataFrame found in cache. Please save a DataFrame with save_df first.")
-    return _df_cache["df"]
+    return _to_json(_get_df(), index=False)
 
 
 # DataFrame의 기본 정보(shape, dtypes 등)를 확인하는 함수
@@ -44,17 +154,18 @@ def basic_data_check(
     Returns:
         The result of the requested data check operation.
     """
-    df = _df_cache["df"]
-    operations = {
-        "shape": lambda: df.shape,
-        "dtypes": lambda: df.dtypes,
-        "missing": lambda: df.isnull().sum(),
-        "columns": lambda: list(df.columns),
-        "describe": lambda: df.describe()
-    }
-    if operation not in operations:
-        raise ValueError(f"Unsupported operation: {operation}")
-    return operations[operation]()
+    df = _get_df()
+    if operation == "shape":
+        return df.shape
+    elif operation == "dtypes":
+        return _to_json(df.dtypes.astype(str))
+    elif operation == "missing":
+        return _to_json(pd.Series({c: _count_missing(df[c]) for c in df.columns}))
+    elif operation == "columns":
+        return list(df.columns)
+    elif operation == "describe":
+        return _to_json(_describe(df))
+    raise ValueError(f"Unsupported operation: {operation}")
 
 
 # 컬럼 데이터 확인(고유값, 값별 개수) 함수
@@ -74,16 +185,14 @@ def column_data_check(
     Returns:
         The unique values or value counts of the column
     """
-    df = _df_cache["df"]
+    df = _get_df()
     if column not in df.columns:
         raise ValueError(f"Column '{column}' not found in DataFrame.")
-    operations = {
-        "unique": lambda: df[column].unique(),
-        "value_counts": lambda: df[column].value_counts()
-    }
-    if operation not in operations:
-        raise ValueError(f"Unsupported operation: {operation}")
-    return operations[operation]()
+    if operation == "unique":
+        return _to_json(np.asarray(df[column].unique()))
+    elif operation == "value_counts":
+        return _to_json(_value_counts(df[column]))
+    raise ValueError(f"Unsupported operation: {operation}")
 
 
 # 데이터 전처리(결측치 제거, 중복 제거) 함수
@@ -99,18 +208,19 @@ def data_preprocess(
         operation (str): The preprocessing operation to perform (one of "dropna", "drop_duplicates")
 
     Returns:
-        The DataFrame after preprocessing, updated in the cache.
+        The preprocessed DataFrame as a list of row dicts (the cache is updated).
     """
-    df = _df_cache["df"]
-    operations = {
-        "dropna": lambda: df.dropna(),
-        "drop_duplicates": lambda: df.drop_duplicates()
-    }
-    if operation not in operations:
+    df = _get_df()
+    if operation == "dropna":
+        result = df.dropna()
+    elif operation == "drop_duplicates":
+        result = df.drop_duplicates()
+    else:
         raise ValueError(f"Unsupported operation: {operation}")
-    result = operations[operation]()
     _df_cache["df"] = result
-    return result
+    _gb_cache.clear()
+    _filter_cache.clear()
+    return _to_json(result, index=False)
 
 
 # 컬럼 기반 데이터 필터링(크다, 같다, 작다) 함수
@@ -130,17 +240,30 @@ def col_data_analysis(
         condition_value (int): The value to compare against
 
     Returns:
-        The filtered DataFrame
+        The filtered rows as a list of row dicts
     """
-    df = _df_cache["df"]
-    operations = {
-        "filter_gt": lambda: df[df[column] > condition_value],
-        "filter_eq": lambda: df[df[column] == condition_value],
-        "filter_lt": lambda: df[df[column] < condition_value]
-    }
-    if operation not in operations:
-        raise ValueError(f"Unsupported operation: {operation}")
-    return operations[operation]()
+    df = _get_df()
+    key = (id(df), column, operation, condition_value)
+    idx = _filter_cache.get(key)
+    if idx is None:
+        if operation == "filter_gt":
+            mask = df[column].values > condition_value
+        elif operation == "filter_eq":
+            mask = df[column].values == condition_value
+        elif operation == "filter_lt":
+            mask = df[column].values < condition_value
+        else:
+            raise ValueError(f"Unsupported operation: {operation}")
+        # 결측치가 있는 확장 타입(Int64 등)은 <NA>가 섞인 BooleanArray를 돌려주므로 NA를 False로 변환
+        if isinstance(mask, np.ndarray):
+            mask = np.asarray(mask, dtype=bool)
+        else:
+            mask = mask.to_numpy(dtype=bool, na_value=False)
+        idx = np.flatnonzero(mask)
+        if len(_filter_cache) >= FILTER_CACHE_MAXSIZE:
+            _filter_cache.clear()
+        _filter_cache[key] = idx
+    return _to_json(df.take(idx), index=False)
 
 
 # 그룹 기반 데이터 집계(평균, 최대, 합계, 개수) 함수
@@ -162,16 +285,21 @@ def group_data_analysis(
     Returns:
         The result of the group-based aggregation
     """
-    df = _df_cache["df"]
-    operations = {
-        "mean": lambda: df.groupby(group_column)[target_column].mean(),
-        "max": lambda: df.groupby(group_column)[target_column].max(),
-        "sum": lambda: df.groupby(group_column)[target_column].sum(),
-        "count": lambda: df.groupby(group_column)[target_column].count()
-    }
-    if operation not in operations:
-        raise ValueError(f"Unsupported operation: {operation}")
-    return operations[operation]()
+    df = _get_df()
+    key = (id(df), group_column)
+    gb = _gb_cache.get(key)
+    if gb is None:
+        gb = df.groupby(group_column, sort=False, observed=True)
+        _gb_cache[key] = gb
+    if operation == "mean":
+        return _to_json(gb[target_column].mean())
+    elif operation == "max":
+        return _to_json(gb[target_column].max())
+    elif operation == "sum":
+        return _to_json(gb[target_column].sum())
+    elif operation == "count":
+        return _to_json(gb[target_column].count())
+    raise ValueError(f"Unsupported operation: {operation}")
 
 if __name__ == "__main__":
     mcp.run()
@@ -3,20 +3,33 @@ from typing import Annotated, Dict, List, Optional
 from pydantic import Field
 from datetime import datetime, timedelta
 from pathlib import Path
+from contextlib import asynccontextmanager
 import json
 import os
 import base64
+import asyncio
+import httpx
 import pytz
-from email.mime.text import MIMEText
+from email.header import Header
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.oauth2.credentials import Credentials
 
+# 서버 종료 시 Gmail 공용 클라이언트를 닫음
+@asynccontextmanager
+async def lifespan(server):
+    try:
+        yield
+    finally:
+        if _gmail_client is not None:
+            await _gmail_client.aclose()
+
 mcp = FastMCP(
     "Google-MCP",
-    dependencies=["fastmcp","pydantic","google-auth","google-auth-oauthlib", "google-api-python-client"
-    ]
+    dependencies=["fastmcp","pydantic","google-auth","google-auth-oauthlib", "google-api-python-client", "httpx"
+    ],
+    lifespan=lifespan
 )
 
 SCOPES = [
@@ -25,15 +38,20 @@ SCOPES = [
     'https://www.googleapis.com/auth/gmail.readonly'
 ]
 
+# 기본 토큰 파일 경로 (스크립트 위치 기준, 없으면 현재 작업 디렉터리)
+try:
+    DEFAULT_TOKEN_PATH = Path(__file__).resolve().parent / "token.json"
+except NameError:
+    DEFAULT_TOKEN_PATH = Path(os.getcwd()) / "token.json"
+
 class GoogleAuth:
     def __init__(self, scopes=SCOPES, token_file=None, creds_file=None):
-        try:
-            self.token_file = Path(token_file) if token_file else Path(__file__).resolve().parent / "token.json"
-        except NameError:
-            self.token_file = Path(os.getcwd()) / "token.json"
+        self.token_file = Path(token_file) if token_file else DEFAULT_TOKEN_PATH
         self.creds_file = creds_file or os.getenv("GOOGLE_CREDENTIALS_PATH", "credentials.json")
         self.scopes = scopes
         self.creds = None
+        self.creds_expires_at = None
+        self.services = {}
 
     def load_token(self):
         if self.token_file.exists():
@@ -55,6 +73,10 @@ class GoogleAuth:
             print(f"Error saving token: {e}")
 
     def get_credentials(self):
+        # 메모리에 유효한 자격 증명이 있으면 토큰 파일을 다시 읽지 않음
+        if self.creds and self.creds.valid and self.creds_expires_at and datetime.now() < self.creds_expires_at:
+            return self.creds
+
         token, expires_at = self.load_token()
         creds = None
 
@@ -78,20 +100,74 @@ class GoogleAuth:
                 expires_at = datetime.now() + timedelta(hours=1)
                 self.save_token(creds.token, expires_at)
         self.creds = creds
+        self.creds_expires_at = expires_at
         return creds
 
-    def build_calendar_service(self):
+    def build_service(self, api, version):
+        # 같은 자격 증명이면 이전에 만든 service 객체를 재사용
         creds = self.get_credentials()
-        return build('calendar', 'v3', credentials=creds)
+        cached = self.services.get((api, version))
+        if cached and cached[0] is creds:
+            return cached[1]
+        service = build(api, version, credentials=creds, cache_discovery=False, static_discovery=True)
+        self.services[(api, version)] = (creds, service)
+        return service
+
+    def build_calendar_service(self):
+        return self.build_service('calendar', 'v3')
 
     def build_gmail_service(self):
-        creds = self.get_credentials()
-        return build('gmail', 'v1', credentials=creds)
+        return self.build_service('gmail', 'v1')
+
+# 메일 헤더 값 인코딩 (ASCII면 그대로, 아니면 RFC 2047 encoded-word)
+def encode_header_value(value):
+    value = value.replace('\r', ' ').replace('\n', ' ')
+    if value.isascii():
+        return value
+    return Header(value, 'utf-8').encode(linesep='\r\n')
 
 # 인증 클래스 인스턴스 생성
 # Create an instance of the authentication class
 google_auth = GoogleAuth()
 
+# Gmail REST API를 비동기로 호출하기 위한 공용 클라이언트 (첫 사용 시 생성)
+GMAIL_API_URL = "https://gmail.googleapis.com/gmail/v1/users/me"
+_gmail_client = None
+
+def get_gmail_client():
+    global _gmail_client
+    if _gmail_client is None or _gmail_client.is_closed:
+        _gmail_client = httpx.AsyncClient(base_url=GMAIL_API_URL, timeout=10.0)
+    return _gmail_client
+
+# Gmail 사용자별 동시 요청 제한을 넘지 않도록 메타데이터 요청 수를 제한
+GMAIL_CONCURRENCY = 5
+_gmail_semaphore = asyncio.Semaphore(GMAIL_CONCURRENCY)
+
+async def fetch_message_metadata(client, headers, msg_id):
+    async with _gmail_semaphore:
+        response = await client.get(
+            f"/messages/{msg_id}",
+            headers=headers,
+            params={
+                'format': 'metadata',
+                'metadataHeaders': ['From', 'Subject', 'Date'],
+                'fields': 'id,snippet,payload/headers'
+            }
+        )
+    response.raise_for_status()
+    msg_detail = response.json()
+    msg_headers = {}
+    for h in msg_detail['payload']['headers']:
+        msg_headers.setdefault(h['name'], h['value'])
+    return {
+        "id": msg_detail.get("id"),
+        "snippet": msg_detail.get("snippet"),
+        "from": msg_headers.get('From'),
+        "subject": msg_headers.get('Subject'),
+        "date": msg_headers.get('Date'),
+    }
+
 @mcp.tool(
     name="create_calendar_event",
     description="Create a Google Calendar event without a Google Meet link."
@@ -198,6 +274,10 @@ def delete_event(
     service.events().delete(calendarId='primary', eventId=event_id).execute()
     return f"Event deleted: {event_id}"
 
+# list_events 결과 키와 대응하는 Calendar API 필드
+EVENT_RESULT_KEYS = ("event_id", "summary", "start", "end", "calendar_link", "meet_link")
+EVENT_FIELDS = ("id", "summary", "start", "end", "htmlLink", "hangoutLink")
+
 @mcp.tool(
     name="list_events",
     description="List Google Calendar events within a specified time range."
@@ -225,7 +305,8 @@ def list_events(
         'timeMin': time_min,
         'maxResults': max_results,
         'singleEvents': True,
-        'orderBy': 'startTime'
+        'orderBy': 'startTime',
+        'fields': 'items(id,summary,start,end,htmlLink,hangoutLink),nextPageToken'
     }
     if time_max:
         request_params['timeMax'] = time_max
@@ -233,17 +314,7 @@ def list_events(
     events_result = service.events().list(**request_params).execute()
     events = events_result.get('items', [])
 
-    result = []
-    for event in events:
-        result.append({
-            "event_id": event.get("id"),
-            "summary": event.get("summary"),
-            "start": event.get("start"),
-            "end": event.get("end"),
-            "calendar_link": event.get("htmlLink"),
-            "meet_link": event.get("hangoutLink"),
-        })
-    return result
+    return [dict(zip(EVENT_RESULT_KEYS, map(event.get, EVENT_FIELDS))) for event in events]
 
 @mcp.tool(
     name="send_gmail_api",
@@ -264,11 +335,24 @@ def send_gmail_api(
         str: Success or failure message for sending the email.
     """
     service = google_auth.build_gmail_service()
-    message = MIMEText(body)
-    message['to'] = to_email
-    message['from'] = "me"
-    message['subject'] = subject
-    raw = base64.urlsafe_b64encode(message.as_bytes()).decode()
+    # 본문 줄바꿈을 CRLF로 통일
+    body = body.replace('\r\n', '\n').replace('\r', '\n').replace('\n', '\r\n')
+    if body.isascii():
+        transfer_encoding, payload = '7bit', body.encode('ascii')
+    else:
+        # 비ASCII 본문은 base64로 인코딩해 한 줄이 76자를 넘지 않도록 함
+        transfer_encoding = 'base64'
+        payload = base64.encodebytes(body.encode('utf-8')).replace(b'\n', b'\r\n')
+    message = (
+        f"To: {encode_header_value(to_email)}\r\n"
+        "From: me\r\n"
+        f"Subject: {encode_header_value(subject)}\r\n"
+        "MIME-Version: 1.0\r\n"
+        "Content-Type: text/plain; charset=utf-8\r\n"
+        f"Content-Transfer-Encoding: {transfer_encoding}\r\n"
+        "\r\n"
+    ).encode('utf-8') + payload
+    raw = base64.urlsafe_b64encode(message).decode()
     body_data = {'raw': raw}
 
     try:
@@ -281,7 +365,7 @@ def send_gmail_api(
     name="search_gmail_api",
     description="Search emails in Gmail via Gmail API using subject, date range, and mailbox (INBOX or SENT)."
 )
-def search_gmail_api(
+async def search_gmail_api(
     subject: Annotated[str, Field(description="Subject keyword to search for")],
     after: Annotated[Optional[str], Field(description="Start date (YYYY-MM-DD)")] = None,
     before: Annotated[Optional[str], Field(description="End date (YYYY-MM-DD)")] = None,
@@ -299,7 +383,8 @@ def search_gmail_api(
     Returns:
         list: List of email information dictionaries or error message.
     """
-    service = google_auth.build_gmail_service()
+    # 토큰 갱신/브라우저 인증이 이벤트 루프를 막지 않도록 별도 스레드에서 실행
+    creds = await asyncio.to_thread(google_auth.get_credentials)
     query_parts = []
     if subject:
         query_parts.append(f"subject:{subject}")
@@ -319,24 +404,25 @@ def search_gmail_api(
     label_id = 'INBOX' if inbox_or_sent.upper() == 'INBOX' else 'SENT'
 
     try:
-        results = service.users().messages().list(
-            userId='me',
-            q=query,
-            labelIds=[label_id],
-            maxResults=max_results
-        ).execute()
-        messages = results.get('messages', [])
-        details = []
-        for msg in messages:
-            msg_detail = service.users().messages().get(userId='me', id=msg['id']).execute()
-            details.append({
-                "id": msg_detail.get("id"),
-                "snippet": msg_detail.get("snippet"),
-                "from": next((h['value'] for h in msg_detail['payload']['headers'] if h['name'] == 'From'), None),
-                "subject": next((h['value'] for h in msg_detail['payload']['headers'] if h['name'] == 'Subject'), None),
-                "date": next((h['value'] for h in msg_detail['payload']['headers'] if h['name'] == 'Date'), None),
-            })
-        return details
+        client = get_gmail_client()
+        headers = {'Authorization': f"Bearer {creds.token}"}
+        response = await client.get(
+            "/messages",
+            headers=headers,
+            params={
+                'q': query,
+                'labelIds': [label_id],
+                'maxResults': max_results,
+                'fields': 'messages/id,nextPageToken'
+            }
+        )
+        response.raise_for_status()
+        messages = response.json().get('messages', [])
+
+        # 메일별 메타데이터 요청을 동시에 전송
+        return list(await asyncio.gather(
+            *(fetch_message_metadata(client, headers, msg['id']) for msg in messages)
+        ))
     except Exception as e:
         return [{"error": str(e)}]
 
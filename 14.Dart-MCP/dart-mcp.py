@@ -1,6 +1,9 @@
 import OpenDartReader
+import numpy as np
 import pandas as pd
 import os
+import time
+from functools import lru_cache
 from fastmcp import FastMCP
 from typing import Annotated, Literal
 from pydantic import Field
@@ -11,21 +14,57 @@ load_dotenv()
 mcp=FastMCP("Dart-MCP",dependencies=["pandas","requests","OpenDartReader","pydantic"])
 dart = OpenDartReader(os.environ.get("DART_API_KEY"))
 
-REPORT_CODES = [
+# 안내 문구용 (원래 순서 유지)
+REPORT_CODE_CHOICES = (
     '조건부자본증권미상환', '미등기임원보수', '회사채미상환', '단기사채미상환', '기업어음미상환',
     '채무증권발행', '사모자금사용', '공모자금사용', '임원전체보수승인', '임원전체보수유형',
     '주식총수', '회계감사', '감사용역', '회계감사용역계약', '사외이사', '신종자본증권미상환',
     '증자', '배당', '자기주식', '최대주주', '최대주주변동', '소액주주', '임원', '직원',
     '임원개인보수', '임원전체보수', '개인별보수', '타법인출자'
-]
-EVENT_CODES = [
+)
+EVENT_CODE_CHOICES = (
     '부도발생', '영업정지', '회생절차', '해산사유', '유상증자', '무상증자', '유무상증자', '감자',
     '관리절차개시', '소송', '해외상장결정', '해외상장폐지결정', '해외상장', '해외상장폐지',
     '전환사채발행', '신주인수권부사채발행', '교환사채발행', '관리절차중단', '조건부자본증권발행',
     '자산양수도', '타법인증권양도', '유형자산양도', '유형자산양수', '타법인증권양수', '영업양도',
     '영업양수', '자기주식취득신탁계약해지', '자기주식취득신탁계약체결', '자기주식처분', '자기주식취득',
     '주식교환', '회사분할합병', '회사분할', '회사합병', '사채권양수', '사채권양도결정'
-]
+)
+# 유효성 검사용
+REPORT_CODES = frozenset(REPORT_CODE_CHOICES)
+EVENT_CODES = frozenset(EVENT_CODE_CHOICES)
+
+# OpenDART 응답 캐시 (HTTP 호출 결과는 1시간 동안 재사용)
+CACHE_TTL = 60 * 60
+CACHE_MAXSIZE = 1024
+_api_cache = {}
+
+# 정상 응답만 캐시 (한도 초과 등 일시적 오류로 받은 빈 DataFrame/오류 상태 dict는 제외)
+def _is_cacheable(result):
+    if isinstance(result, pd.DataFrame):
+        return not result.empty
+    if isinstance(result, dict):
+        return result.get('status') == '000'
+    return result is not None
+
+def _cached_call(func, *args):
+    key = (func.__name__, args)
+    now = time.monotonic()
+    hit = _api_cache.get(key)
+    if hit and now < hit[0]:
+        return hit[1]
+    result = func(*args)
+    if not _is_cacheable(result):
+        return result
+    if len(_api_cache) >= CACHE_MAXSIZE:
+        _api_cache.clear()
+    _api_cache[key] = (now + CACHE_TTL, result)
+    return result
+
+# 기업명 -> 고유번호 매핑은 프로세스 동안 변하지 않으므로 메모이즈
+@lru_cache(maxsize=4096)
+def _find_corp_code(corp_name):
+    return dart.find_corp_code(corp_name)
 
 # 0. 기업명으로 고유번호 얻기
 @mcp.tool(name="get_corp_code",description="Fetch the corporate code of a company.")
@@ -39,7 +78,7 @@ def get_corp_code(
     Returns:
         str: Corporate code of the company.
     """
-    return dart.find_corp_code(corp_name)
+    return _find_corp_code(corp_name)
 
 # 1. 공시정보 - 기업개황 : 기업의 개황정보
 @mcp.tool(name="get_company_overview",description="Fetch the general overview information of a company.")
@@ -53,7 +92,7 @@ def get_company_overview(
     Returns:
         dict: Company overview information.
     """
-    return dart.company(corp_code)
+    return _cached_call(dart.company, corp_code)
 
 # 2. 기업의 주요계정과목(재무상태표, 손익계산서) , 안됨 
 @mcp.tool(name="get_financial_statement",description="Fetch the company's main financial statement items (Balance Sheet or Income Statement).")
@@ -74,11 +113,14 @@ def get_financial_statement(
     Returns:
         DataFrame: Filtered financial statement data.
     """
-    df = dart.finstate(corp_code, date, report_code)
-    filtered_df = df[(df['fs_div'] == 'CFS') & (df['sj_div'] == sj_div)]
-    if filtered_df.empty:
-        filtered_df = df[(df['fs_div'] == 'OFS') & (df['sj_div'] == sj_div)]
-    filtered_df = filtered_df[["corp_code", "bsns_year", "reprt_code", "account_nm", "thstrm_amount"]]
+    df = _cached_call(dart.finstate, corp_code, date, report_code)
+    # 연결재무제표(CFS)가 없으면 개별재무제표(OFS)로 대체
+    fs_div = df['fs_div'].values
+    sj_mask = df['sj_div'].values == sj_div
+    idx = np.flatnonzero((fs_div == 'CFS') & sj_mask)
+    if idx.size == 0:
+        idx = np.flatnonzero((fs_div == 'OFS') & sj_mask)
+    filtered_df = df.iloc[idx][["corp_code", "bsns_year", "reprt_code", "account_nm", "thstrm_amount"]]
     return filtered_df
 
 # 3. 사업보고서 
@@ -88,7 +130,7 @@ def get_financial_statement(
 )
 def get_specific_business_report(
     corp_code: Annotated[str, Field(description="Corporate code of the company.")],
-    report_code: Annotated[str, Field(description=f"Report code. Must be one of: {REPORT_CODES}")],
+    report_code: Annotated[str, Field(description=f"Report code. Must be one of: {list(REPORT_CODE_CHOICES)}")],
     date: Annotated[str, Field(description="Year in 'yyyy' format.")]
 ):
     """
@@ -103,9 +145,9 @@ def get_specific_business_report(
         dict or DataFrame: Business report information, or error message if report_code is invalid or no data found.
     """
     if report_code not in REPORT_CODES:
-        return {"error": f"report_code must be one of: {REPORT_CODES}"}
+        return {"error": f"report_code must be one of: {list(REPORT_CODE_CHOICES)}"}
 
-    result = dart.report(corp_code, report_code, date)
+    result = _cached_call(dart.report, corp_code, report_code, date)
     
     if isinstance(result, pd.DataFrame) and result.empty:
         return {"message": "No data found for the given parameters."}
@@ -119,7 +161,7 @@ def get_specific_business_report(
 )
 def get_major_event_report(
     corp_code: Annotated[str, Field(description="Corporate code of the company.")],
-    event: Annotated[str, Field(description=f"Event code. Must be one of: {EVENT_CODES}")],
+    event: Annotated[str, Field(description=f"Event code. Must be one of: {list(EVENT_CODE_CHOICES)}")],
     date: Annotated[str, Field(description="Year in 'yyyy' format.")]
 ):
     """
@@ -134,9 +176,9 @@ def get_major_event_report(
         dict or DataFrame: Major event report information, or error message if event is invalid or no data found.
     """
     if event not in EVENT_CODES:
-        return {"error": f"event must be one of: {EVENT_CODES}"}
+        return {"error": f"event must be one of: {list(EVENT_CODE_CHOICES)}"}
 
-    result = dart.event(corp_code, event, date)
+    result = _cached_call(dart.event, corp_code, event, date)
 
     if isinstance(result, pd.DataFrame) and result.empty:
         return {"message": "No data found for the given parameters."}
@@ -1,19 +1,77 @@
 import os
 import sys
-import json
+import logging
+import asyncio
+import time
+import random
+from operator import itemgetter
+from contextlib import asynccontextmanager
 from pathlib import Path
-from datetime import datetime, timedelta
+from types import MappingProxyType
 import httpx
+import orjson
 from dotenv import load_dotenv
 from fastmcp import FastMCP
 from typing import Annotated
 from pydantic import Field
-import pandas as pd
 
 # 환경변수 로드
 load_dotenv()
+APP_KEY = os.environ.get("KIS_APP_KEY")
+APP_SECRET = os.environ.get("KIS_APP_SECRET")
+CANO = os.environ.get("KIS_CANO")
 
-mcp = FastMCP(name="KIStock-MCP",dependencies=["httpx","pydantic","pandas"])
+logger = logging.getLogger(__name__)
+
+# 모든 tool이 공유하는 HTTP 클라이언트 (HTTP/2, keep-alive 연결 재사용)
+_client = None
+
+def get_client() -> httpx.AsyncClient:
+    global _client
+    if _client is None or _client.is_closed:
+        # 인증 정보 없이 None 헤더로 요청하지 않도록 클라이언트 생성 시 한 번 확인
+        if not APP_KEY or not APP_SECRET:
+            raise RuntimeError("KIS_APP_KEY and KIS_APP_SECRET must be set in the environment or .env file.")
+        _client = httpx.AsyncClient(
+            base_url=DOMAIN,
+            headers=_BASE_HEADERS,
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+            timeout=httpx.Timeout(10.0)
+        )
+    return _client
+
+# 만료 10분 전에 토큰을 미리 갱신하는 백그라운드 작업 (토큰이 없으면 1분마다 재시도)
+TOKEN_REFRESH_MIN_INTERVAL = 60
+
+async def _refresh_token_loop():
+    while True:
+        await asyncio.sleep(max(TOKEN_REFRESH_MIN_INTERVAL, KISAuthManager.seconds_until_refresh()))
+        try:
+            await KISAuthManager.get_access_token(get_client())
+        except Exception as e:
+            logger.warning("Failed to refresh KIS access token: %s", e)
+
+@asynccontextmanager
+async def lifespan(server):
+    # 첫 tool 호출이 토큰 발급을 기다리지 않도록 시작 시 미리 발급 (실패하면 첫 호출 때 다시 시도)
+    try:
+        await KISAuthManager.get_access_token(get_client())
+    except Exception as e:
+        logger.warning("Failed to warm up KIS access token: %s", e)
+    refresh_task = asyncio.create_task(_refresh_token_loop())
+    try:
+        yield
+    finally:
+        refresh_task.cancel()
+        try:
+            await refresh_task
+        except asyncio.CancelledError:
+            pass
+        if _client is not None:
+            await _client.aclose()
+
+mcp = FastMCP(name="KIStock-MCP",dependencies=["httpx[http2]","orjson","pydantic","uvloop; sys_platform != 'win32'"],lifespan=lifespan)
 
 class KISAuthManager:
     # 실전/모의투자 도메인 및 경로
@@ -24,9 +82,18 @@ class KISAuthManager:
     CONTENT_TYPE = "application/json"
     AUTH_TYPE = "Bearer"
     TOKEN_FILE = Path(__file__).resolve().parent / "token.json"
+    # 토큰 유효기간과, 만료 10분 전부터 새 토큰을 발급하기 위한 여유 시간 (초)
+    TOKEN_LIFETIME = 23 * 60 * 60
+    TOKEN_REFRESH_MARGIN = 10 * 60
+
+    # 메모리 토큰 캐시: ("KIS", 계좌 유형) -> (토큰, time.monotonic() 기준 만료 시각)
+    # token.json은 최초 실행 시에만 읽고, 새 토큰을 발급했을 때 한 번 기록
+    _token_cache = {}
+    # 동시에 여러 요청이 토큰을 재발급하지 않도록 하는 락 (첫 사용 시 생성)
+    _token_lock = None
 
-    # 실전/모의투자 TR_ID
-    REAL_TR = {
+    # 실전/모의투자 TR_ID (읽기 전용)
+    REAL_TR = MappingProxyType({
         "price": "FHKST01010100",
         "balance": "TTTC8434R",
         "buy": "TTTC0802U",
@@ -34,8 +101,8 @@ class KISAuthManager:
         "order_list": "TTTC8001R",
         "stock_ask": "FHKST01010200",
         "stock_info": "FHKST01010400",
-    }
-    VIRTUAL_TR = {
+    })
+    VIRTUAL_TR = MappingProxyType({
         "price": "FHKST01010100",
         "balance": "VTTC8434R",
         "buy": "VTTC0802U",
@@ -44,76 +111,272 @@ class KISAuthManager:
         "order_detail": "VTTC80362R",
         "stock_info": "FHKST01010400",
         "stock_ask": "FHKST01010200",
-    }
+    })
 
     @classmethod
     def is_real(cls):
         return os.environ.get("KIS_ACCOUNT_TYPE", "REAL").upper() == "REAL"
 
-    @classmethod
-    def get_domain(cls):
-        return cls.DOMAIN if cls.is_real() else cls.VIRTUAL_DOMAIN
-
-    @classmethod
-    def get_tr_id(cls, key):
-        return cls.REAL_TR.get(key) if cls.is_real() else cls.VIRTUAL_TR.get(key)
-
     @classmethod
     def load_token(cls):
         if cls.TOKEN_FILE.exists():
             try:
-                with open(cls.TOKEN_FILE, 'r') as f:
-                    token_data = json.load(f)
-                    expires_at = datetime.fromisoformat(token_data['expires_at'])
-                    if datetime.now() < expires_at:
+                with open(cls.TOKEN_FILE, 'rb') as f:
+                    token_data = orjson.loads(f.read())
+                    expires_at = token_data['expires_at']
+                    if time.time() < expires_at:
                         return token_data['token'], expires_at
-            except Exception as e:
-                print(f"Error loading token: {e}", file=sys.stderr)
+            # 파일이 손상되었거나 형식이 다르면 새 토큰을 발급받도록 넘어감
+            except (FileNotFoundError, KeyError, TypeError, ValueError, orjson.JSONDecodeError) as e:
+                logger.debug("Ignoring unreadable token file: %s", e)
         return None, None
 
     @classmethod
-    def save_token(cls, token: str, expires_at: datetime):
+    def save_token(cls, token: str, expires_at: float):
+        # 임시 파일에 쓴 뒤 교체해 쓰기 도중 중단되어도 token.json이 깨지지 않도록 함
+        tmp_file = cls.TOKEN_FILE.with_suffix('.tmp')
         try:
-            with open(cls.TOKEN_FILE, 'w') as f:
-                json.dump({'token': token, 'expires_at': expires_at.isoformat()}, f)
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps({'token': token, 'expires_at': expires_at}))
+            os.replace(tmp_file, cls.TOKEN_FILE)
         except Exception as e:
             print(f"Error saving token: {e}", file=sys.stderr)
 
+    @classmethod
+    def get_cached_token(cls):
+        entry = cls._token_cache.get(TOKEN_CACHE_KEY)
+        if entry and time.monotonic() < entry[1] - cls.TOKEN_REFRESH_MARGIN:
+            return entry[0]
+        return None
+
+    @classmethod
+    def cache_token(cls, token: str, expires_at: float):
+        # 파일의 만료 시각(Unix timestamp)을 monotonic 기준으로 바꿔 보관
+        cls._token_cache[TOKEN_CACHE_KEY] = (token, time.monotonic() + (expires_at - time.time()))
+
+    # 캐시된 토큰의 갱신 시점(만료 10분 전)까지 남은 시간 (초), 토큰이 없으면 0
+    @classmethod
+    def seconds_until_refresh(cls) -> float:
+        entry = cls._token_cache.get(TOKEN_CACHE_KEY)
+        if not entry:
+            return 0.0
+        return entry[1] - cls.TOKEN_REFRESH_MARGIN - time.monotonic()
+
     @classmethod
     async def get_access_token(cls, client: httpx.AsyncClient) -> str:
-        token, expires_at = cls.load_token()
-        if token and expires_at and datetime.now() < expires_at:
+        token = cls.get_cached_token()
+        if token:
+            return token
+        if cls._token_lock is None:
+            cls._token_lock = asyncio.Lock()
+        async with cls._token_lock:
+            # 락을 기다리는 동안 다른 요청이 이미 갱신했을 수 있으므로 다시 확인
+            token = cls.get_cached_token()
+            if token:
+                return token
+            token, expires_at = cls.load_token()
+            if token and expires_at and time.time() < expires_at - cls.TOKEN_REFRESH_MARGIN:
+                cls.cache_token(token, expires_at)
+                return token
+            token_response = await client.post(
+                cls.TOKEN_PATH,
+                json={
+                    "grant_type": "client_credentials",
+                    "appkey": APP_KEY,
+                    "appsecret": APP_SECRET
+                }
+            )
+            if token_response.status_code >= 300:
+                token_response.raise_for_status()
+            token_data = orjson.loads(token_response.content)
+            token = token_data["access_token"]
+            expires_at = time.time() + cls.TOKEN_LIFETIME
+            cls.cache_token(token, expires_at)
+            cls.save_token(token, expires_at)
             return token
-        token_response = await client.post(
-            f"{cls.get_domain()}{cls.TOKEN_PATH}",
-            headers={"content-type": cls.CONTENT_TYPE},
-            json={
-                "grant_type": "client_credentials",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"]
-            }
-        )
-        token_response.raise_for_status()
-        token_data = token_response.json()
-        token = token_data["access_token"]
-        expires_at = datetime.now() + timedelta(hours=23)
-        cls.save_token(token, expires_at)
-        return token
 
     @classmethod
     async def get_hashkey(cls, client: httpx.AsyncClient, token: str, body: dict) -> str:
         response = await client.post(
-            f"{cls.get_domain()}{cls.HASHKEY_PATH}",
-            headers={
-                "content-type": cls.CONTENT_TYPE,
-                "authorization": f"{cls.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-            },
+            cls.HASHKEY_PATH,
+            headers={"authorization": f"{cls.AUTH_TYPE} {token}"},
             json=body
         )
+        if response.status_code >= 300:
+            response.raise_for_status()
+        return orjson.loads(response.content)["HASH"]
+
+# 실행 중에는 계좌 유형이 바뀌지 않으므로 도메인과 TR_ID 테이블을 한 번만 결정
+_IS_REAL = KISAuthManager.is_real()
+DOMAIN = KISAuthManager.DOMAIN if _IS_REAL else KISAuthManager.VIRTUAL_DOMAIN
+TR = KISAuthManager.REAL_TR if _IS_REAL else KISAuthManager.VIRTUAL_TR
+TOKEN_CACHE_KEY = ("KIS", "REAL" if _IS_REAL else "VIRTUAL")
+
+# tool별 TR_ID
+TR_PRICE = TR["price"]
+TR_BALANCE = TR["balance"]
+TR_BUY = TR["buy"]
+TR_SELL = TR["sell"]
+TR_ORDER_LIST = TR["order_list"]
+TR_STOCK_ASK = TR["stock_ask"]
+TR_STOCK_INFO = TR["stock_info"]
+
+# API 경로 (공용 클라이언트의 base_url 기준)
+STOCK_PRICE_PATH = "/uapi/domestic-stock/v1/quotations/inquire-price"
+BALANCE_PATH = "/uapi/domestic-stock/v1/trading/inquire-balance"
+ORDER_PATH = "/uapi/domestic-stock/v1/trading/order-cash"
+ORDER_LIST_PATH = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
+STOCK_ASK_PATH = "/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn"
+STOCK_INFO_PATH = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
+
+# 모든 요청에 공통으로 들어가는 헤더 (공용 클라이언트의 기본 헤더로 설정)
+_BASE_HEADERS = {
+    "content-type": KISAuthManager.CONTENT_TYPE,
+    "appkey": APP_KEY,
+    "appsecret": APP_SECRET,
+}
+
+# 요청마다 달라지는 헤더만 생성
+def _auth_headers(token: str, tr_id: str) -> dict:
+    return {"authorization": f"{KISAuthManager.AUTH_TYPE} {token}", "tr_id": tr_id}
+
+# 응답에서 추출할 컬럼 (itemgetter는 모듈 로드 시 한 번만 생성)
+PRICE_KEYS = (
+    "stck_shrn_iscd", "rprs_mrkt_kor_name", "bstp_kor_isnm", "stck_prpr", "prdy_vrss", "prdy_ctrt",
+    "stck_oprc", "stck_hgpr", "stck_lwpr", "acml_vol", "acml_tr_pbmn", "per", "pbr",
+    "eps", "bps", "hts_frgn_ehrt", "frgn_ntby_qty", "pgtr_ntby_qty"
+)
+BALANCE_OUTPUT1_KEYS = (
+    "pdno", "prdt_name", "hldg_qty", "ord_psbl_qty", "pchs_avg_pric",
+    "prpr", "evlu_amt", "evlu_pfls_amt", "evlu_pfls_rt"
+)
+BALANCE_OUTPUT2_KEYS = (
+    "dnca_tot_amt", "scts_evlu_amt", "tot_evlu_amt", "nass_amt",
+    "evlu_pfls_smtl_amt", "asst_icdc_amt", "asst_icdc_erng_rt"
+)
+ORDER_LIST_KEYS = (
+    "ord_dt", "odno", "ord_dvsn_name", "sll_buy_dvsn_cd_name",
+    "pdno", "prdt_name", "ord_qty", "ord_unpr",
+    "tot_ccld_qty", "avg_prvs", "tot_ccld_amt",
+    "cncl_yn", "rmn_qty", "rjct_qty"
+)
+ASK_OUTPUT1_KEYS = (
+    "askp1", "askp_rsqn1", "bidp1", "bidp_rsqn1", "total_askp_rsqn", "total_bidp_rsqn"
+)
+ASK_OUTPUT2_KEYS = (
+    "stck_prpr", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_sdpr", "stck_shrn_iscd"
+)
+DAILY_PRICE_KEYS = ("stck_bsop_date", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_clpr")
+
+PRICE_GETTER = itemgetter(*PRICE_KEYS)
+BALANCE_OUTPUT1_GETTER = itemgetter(*BALANCE_OUTPUT1_KEYS)
+BALANCE_OUTPUT2_GETTER = itemgetter(*BALANCE_OUTPUT2_KEYS)
+ORDER_LIST_GETTER = itemgetter(*ORDER_LIST_KEYS)
+ASK_OUTPUT1_GETTER = itemgetter(*ASK_OUTPUT1_KEYS)
+ASK_OUTPUT2_GETTER = itemgetter(*ASK_OUTPUT2_KEYS)
+DAILY_PRICE_GETTER = itemgetter(*DAILY_PRICE_KEYS)
+
+# 응답 항목에서 keys에 해당하는 값만 추출 (빠진 키는 None으로 채우거나, drop_missing이면 생략)
+def _project(item: dict, keys: tuple, getter: itemgetter, drop_missing: bool = False) -> dict:
+    try:
+        return dict(zip(keys, getter(item)))
+    except KeyError:
+        if drop_missing:
+            return {key: item[key] for key in keys if key in item}
+        return {key: item.get(key) for key in keys}
+
+# 시세 응답 캐시: (tool 이름, 종목코드) -> (time.monotonic() 기준 만료 시각, 결과)
+# 짧은 시간 안에 같은 종목을 반복 조회할 때 KIS 호출을 줄이기 위한 1초 캐시
+QUOTE_CACHE_TTL = 1.0
+QUOTE_CACHE_MAXSIZE = 512
+_quote_cache = {}
+
+def _get_cached_quote(key: tuple):
+    entry = _quote_cache.get(key)
+    if entry and time.monotonic() < entry[0]:
+        return entry[1]
+    return None
+
+def _cache_quote(key: tuple, value: dict):
+    if len(_quote_cache) >= QUOTE_CACHE_MAXSIZE:
+        _quote_cache.clear()
+    _quote_cache[key] = (time.monotonic() + QUOTE_CACHE_TTL, value)
+
+# 일시적인 오류(429/5xx, 네트워크 오류)는 지수 백오프 + 지터로 재시도 (멱등한 조회 요청에만 사용)
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+RETRY_ATTEMPTS = 3
+
+async def _with_retry(func, *args, attempts: int = RETRY_ATTEMPTS):
+    for attempt in range(attempts):
+        try:
+            return await func(*args)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code not in RETRY_STATUS_CODES or attempt == attempts - 1:
+                raise
+        except httpx.TransportError:
+            if attempt == attempts - 1:
+                raise
+        await asyncio.sleep(0.1 * 2 ** attempt + random.uniform(0, 0.05))
+
+async def _get_json(client: httpx.AsyncClient, path: str, headers: dict, params: dict) -> dict:
+    response = await client.get(path, headers=headers, params=params)
+    if response.status_code >= 300:
         response.raise_for_status()
-        return response.json()["HASH"]
+    return orjson.loads(response.content)
+
+# 응답이 큰 GET 요청: 본문을 청크 단위로 받아 bytearray에 모은 뒤 한 번에 파싱
+STREAM_CHUNK_SIZE = 64 * 1024
+
+async def _get_json_stream(client: httpx.AsyncClient, path: str, headers: dict, params: dict) -> dict:
+    async with client.stream("GET", path, headers=headers, params=params) as response:
+        if response.status_code >= 300:
+            response.raise_for_status()
+        buf = bytearray()
+        async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+            buf += chunk
+    return orjson.loads(buf)
+
+# 공통 GET 요청: 토큰 발급, 헤더 구성, 상태 확인, JSON 파싱을 한 곳에서 처리
+async def _kis_get(tr_id: str, path: str, params: dict, stream: bool = False) -> dict:
+    client = get_client()
+    token = await KISAuthManager.get_access_token(client)
+    fetch = _get_json_stream if stream else _get_json
+    return await _with_retry(fetch, client, path, _auth_headers(token, tr_id), params)
+
+# 공통 POST 요청: 본문으로 hashkey를 발급받아 헤더에 함께 전송
+async def _kis_post(tr_id: str, path: str, body: dict) -> dict:
+    client = get_client()
+    token = await KISAuthManager.get_access_token(client)
+    hashkey = await KISAuthManager.get_hashkey(client, token, body)
+    response = await client.post(
+        path,
+        headers={**_auth_headers(token, tr_id), "hashkey": hashkey},
+        json=body
+    )
+    if response.status_code >= 300:
+        response.raise_for_status()
+    return orjson.loads(response.content)
+
+# 현재가 조회 (KIS 호출 제한을 고려해 동시 요청 수를 제한)
+PRICE_CONCURRENCY = 10
+_price_semaphore = asyncio.Semaphore(PRICE_CONCURRENCY)
+
+async def _fetch_price(symbol: str) -> dict:
+    cache_key = ("get_stock_price", symbol)
+    cached = _get_cached_quote(cache_key)
+    if cached is not None:
+        return cached
+    async with _price_semaphore:
+        data = await _kis_get(TR_PRICE, STOCK_PRICE_PATH, {
+            "fid_cond_mrkt_div_code": "J",
+            "fid_input_iscd": symbol
+        })
+    data = data.get("output")
+    if not data:
+        return {"message": "No data found for the given symbol."}
+    result = _project(data, PRICE_KEYS, PRICE_GETTER)
+    _cache_quote(cache_key, result)
+    return result
 
 # MCP TOOL: 현재가 조회
 @mcp.tool(
@@ -127,33 +390,21 @@ async def get_stock_price(
     MCP tool for fetching current stock price.
     Returns error message if no data found.
     """
-    STOCK_PRICE_PATH = "/uapi/domestic-stock/v1/quotations/inquire-price"
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        response = await client.get(
-            f"{KISAuthManager.get_domain()}{STOCK_PRICE_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id("price")
-            },
-            params={
-                "fid_cond_mrkt_div_code": "J",
-                "fid_input_iscd": symbol
-            }
-        )
-        response.raise_for_status()
-        data = response.json().get("output")
-        if not data or (isinstance(data, dict) and not data):
-            return {"message": "No data found for the given symbol."}
-        keys = [
-            "stck_shrn_iscd", "rprs_mrkt_kor_name", "bstp_kor_isnm", "stck_prpr", "prdy_vrss", "prdy_ctrt",
-            "stck_oprc", "stck_hgpr", "stck_lwpr", "acml_vol", "acml_tr_pbmn", "per", "pbr",
-            "eps", "bps", "hts_frgn_ehrt", "frgn_ntby_qty", "pgtr_ntby_qty"
-        ]
-        return {key: data.get(key) for key in keys}
+    return await _fetch_price(symbol)
+
+# MCP TOOL: 여러 종목 현재가 동시 조회
+@mcp.tool(
+    name="get_stock_prices_bulk",
+    description="Fetch the current price information for multiple stock symbols at once."
+)
+async def get_stock_prices_bulk(
+    symbols: Annotated[list[str], Field(description="List of stock symbols (6 digits each)")]
+) -> list[dict]:
+    """
+    MCP tool for fetching current prices of several stocks concurrently.
+    Results are returned in the same order as the given symbols.
+    """
+    return await asyncio.gather(*(_fetch_price(symbol) for symbol in symbols))
 
 # MCP TOOL: 잔고 조회
 @mcp.tool(
@@ -165,64 +416,32 @@ async def get_account_balance() -> dict:
     MCP tool for fetching account balance.
     Returns error message if no data found.
     """
-    BALANCE_PATH = "/uapi/domestic-stock/v1/trading/inquire-balance"
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        params = {
-            "CANO": os.environ["KIS_CANO"],
-            "ACNT_PRDT_CD": "01",
-            "AFHR_FLPR_YN": "N",
-            "INQR_DVSN": "01",
-            "UNPR_DVSN": "01",
-            "FUND_STTL_ICLD_YN": "N",
-            "FNCG_AMT_AUTO_RDPT_YN": "N",
-            "PRCS_DVSN": "00",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": "",
-            "OFL_YN": ""
-        }
-        response = await client.get(
-            f"{KISAuthManager.get_domain()}{BALANCE_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id("balance")
-            },
-            params=params
-        )
-        response.raise_for_status()
-        data = response.json()
-        if not data or "output1" not in data or not data["output1"]:
-            return {"message": "No balance data found."}
-
-        # 추출할 컬럼 리스트
-        output1_keys = [
-            "pdno", "prdt_name", "hldg_qty", "ord_psbl_qty", "pchs_avg_pric",
-            "prpr", "evlu_amt", "evlu_pfls_amt", "evlu_pfls_rt"
-        ]
-        output2_keys = [
-            "dnca_tot_amt", "scts_evlu_amt", "tot_evlu_amt", "nass_amt",
-            "evlu_pfls_smtl_amt", "asst_icdc_amt", "asst_icdc_erng_rt"
-        ]
-
-        # output1(보유 종목)에서 필요한 컬럼만 추출
-        filtered_output1 = [
-            {key: item.get(key) for key in output1_keys}
-            for item in data.get("output1", [])
-        ]
-
-        # output2(계좌 요약)에서 필요한 컬럼만 추출
-        filtered_output2 = [
-            {key: item.get(key) for key in output2_keys}
+    data = await _kis_get(TR_BALANCE, BALANCE_PATH, {
+        "CANO": CANO,
+        "ACNT_PRDT_CD": "01",
+        "AFHR_FLPR_YN": "N",
+        "INQR_DVSN": "01",
+        "UNPR_DVSN": "01",
+        "FUND_STTL_ICLD_YN": "N",
+        "FNCG_AMT_AUTO_RDPT_YN": "N",
+        "PRCS_DVSN": "00",
+        "CTX_AREA_FK100": "",
+        "CTX_AREA_NK100": "",
+        "OFL_YN": ""
+    })
+    if not data or not data.get("output1"):
+        return {"message": "No balance data found."}
+    # output1(보유 종목), output2(계좌 요약)에서 필요한 컬럼만 추출
+    return {
+        "output1": [
+            _project(item, BALANCE_OUTPUT1_KEYS, BALANCE_OUTPUT1_GETTER)
+            for item in data["output1"]
+        ],
+        "output2": [
+            _project(item, BALANCE_OUTPUT2_KEYS, BALANCE_OUTPUT2_GETTER)
             for item in data.get("output2", [])
         ]
-
-        return {
-            "output1": filtered_output1,
-            "output2": filtered_output2
-        }
+    }
 
 
 # MCP TOOL: 매수/매도 주문
@@ -240,38 +459,20 @@ async def place_order(
     MCP tool for placing a buy or sell order.
     Returns error message if order_type is invalid or order fails.
     """
-    ORDER_PATH = "/uapi/domestic-stock/v1/trading/order-cash"
     order_type = order_type.lower()
     if order_type not in ["buy", "sell"]:
         return {"error": "order_type must be either 'buy' or 'sell'."}
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        request_data = {
-            "CANO": os.environ["KIS_CANO"],
-            "ACNT_PRDT_CD": "01",
-            "PDNO": symbol,
-            "ORD_DVSN": "01" if price == 0 else "00",
-            "ORD_QTY": str(quantity),
-            "ORD_UNPR": str(price),
-        }
-        hashkey = await KISAuthManager.get_hashkey(client, token, request_data)
-        response = await client.post(
-            f"{KISAuthManager.get_domain()}{ORDER_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id(order_type),
-                "hashkey": hashkey
-            },
-            json=request_data
-        )
-        response.raise_for_status()
-        data = response.json()
-        if not data or "output" not in data:
-            return {"message": "Order failed or no response."}
-        return data
+    data = await _kis_post(TR_BUY if order_type == "buy" else TR_SELL, ORDER_PATH, {
+        "CANO": CANO,
+        "ACNT_PRDT_CD": "01",
+        "PDNO": symbol,
+        "ORD_DVSN": "01" if price == 0 else "00",
+        "ORD_QTY": str(quantity),
+        "ORD_UNPR": str(price),
+    })
+    if not data or "output" not in data:
+        return {"message": "Order failed or no response."}
+    return data
 
 # MCP TOOL: 주문내역 조회
 @mcp.tool(
@@ -286,60 +487,35 @@ async def get_order_list(
     MCP tool for fetching order list.
     Returns error message if no data found.
     """
-    ORDER_LIST_PATH = "/uapi/domestic-stock/v1/trading/inquire-daily-ccld"
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        params = {
-            "CANO": os.environ["KIS_CANO"],
-            "ACNT_PRDT_CD": "01",
-            "INQR_STRT_DT": start_date,
-            "INQR_END_DT": end_date,
-            "SLL_BUY_DVSN_CD": "00",
-            "INQR_DVSN": "00",
-            "PDNO": "",
-            "CCLD_DVSN": "00",
-            "ORD_GNO_BRNO": "",
-            "ODNO": "",
-            "INQR_DVSN_3": "00",
-            "INQR_DVSN_1": "",
-            "CTX_AREA_FK100": "",
-            "CTX_AREA_NK100": "",
-        }
-        response = await client.get(
-            f"{KISAuthManager.get_domain()}{ORDER_LIST_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id("order_list")
-            },
-            params=params
-        )
-        response.raise_for_status()
-        data = response.json()
-        if not data or "output1" not in data or not data["output1"]:
-            return {"message": "No order history found for the given period."}
-        # 중요한 컬럼만 추출
-        important_columns = [
-            "ord_dt", "odno", "ord_dvsn_name", "sll_buy_dvsn_cd_name",
-            "pdno", "prdt_name", "ord_qty", "ord_unpr",
-            "tot_ccld_qty", "avg_prvs", "tot_ccld_amt",
-            "cncl_yn", "rmn_qty", "rjct_qty"
-        ]
-        filtered_output1 = []
-        for item in data["output1"]:
-            filtered_item = {key: item[key] for key in important_columns if key in item}
-            filtered_output1.append(filtered_item)
-        # output2는 그대로 반환
-        result = {
-            "output1": filtered_output1,
-            "output2": data.get("output2", {}),
-            "rt_cd": data.get("rt_cd", ""),
-            "msg_cd": data.get("msg_cd", ""),
-            "msg1": data.get("msg1", "")
-        }
-        return result
+    data = await _kis_get(TR_ORDER_LIST, ORDER_LIST_PATH, {
+        "CANO": CANO,
+        "ACNT_PRDT_CD": "01",
+        "INQR_STRT_DT": start_date,
+        "INQR_END_DT": end_date,
+        "SLL_BUY_DVSN_CD": "00",
+        "INQR_DVSN": "00",
+        "PDNO": "",
+        "CCLD_DVSN": "00",
+        "ORD_GNO_BRNO": "",
+        "ODNO": "",
+        "INQR_DVSN_3": "00",
+        "INQR_DVSN_1": "",
+        "CTX_AREA_FK100": "",
+        "CTX_AREA_NK100": "",
+    })
+    if not data or not data.get("output1"):
+        return {"message": "No order history found for the given period."}
+    # 중요한 컬럼만 추출하고 output2는 그대로 반환
+    return {
+        "output1": [
+            _project(item, ORDER_LIST_KEYS, ORDER_LIST_GETTER, drop_missing=True)
+            for item in data["output1"]
+        ],
+        "output2": data.get("output2", {}),
+        "rt_cd": data.get("rt_cd", ""),
+        "msg_cd": data.get("msg_cd", ""),
+        "msg1": data.get("msg1", "")
+    }
 
 # MCP TOOL: 호가 조회
 @mcp.tool(
@@ -353,40 +529,21 @@ async def get_stock_ask_price(
     MCP tool for fetching stock ask/bid price.
     Returns error message if no data found.
     """
-    STOCK_ASK_PATH = "/uapi/domestic-stock/v1/quotations/inquire-asking-price-exp-ccn"
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        params = {
-            "FID_COND_MRKT_DIV_CODE": "J",
-            "FID_INPUT_ISCD": symbol,
-        }
-        response = await client.get(
-            f"{KISAuthManager.get_domain()}{STOCK_ASK_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id("stock_ask")
-            },
-            params=params
-        )
-        if response.status_code != 200:
-            raise Exception(f"Failed to get stock ask price: {response.text}")
-        data = response.json()
-        # 핵심 컬럼만 추출
-        output1_keys = [
-            "askp1", "askp_rsqn1", "bidp1", "bidp_rsqn1", "total_askp_rsqn", "total_bidp_rsqn"
-        ]
-        output2_keys = [
-            "stck_prpr", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_sdpr", "stck_shrn_iscd"
-        ]
-        filtered_output1 = {key: data.get("output1", {}).get(key) for key in output1_keys}
-        filtered_output2 = {key: data.get("output2", {}).get(key) for key in output2_keys}
-        return {
-            "output1": filtered_output1,
-            "output2": filtered_output2
-        }
+    cache_key = ("get_stock_ask_price", symbol)
+    cached = _get_cached_quote(cache_key)
+    if cached is not None:
+        return cached
+    data = await _kis_get(TR_STOCK_ASK, STOCK_ASK_PATH, {
+        "FID_COND_MRKT_DIV_CODE": "J",
+        "FID_INPUT_ISCD": symbol,
+    })
+    # 핵심 컬럼만 추출
+    result = {
+        "output1": _project(data.get("output1", {}), ASK_OUTPUT1_KEYS, ASK_OUTPUT1_GETTER),
+        "output2": _project(data.get("output2", {}), ASK_OUTPUT2_KEYS, ASK_OUTPUT2_GETTER)
+    }
+    _cache_quote(cache_key, result)
+    return result
 
 # MCP TOOL: 일별주가 조회
 @mcp.tool(
@@ -403,38 +560,25 @@ async def get_daily_price(
     MCP tool for fetching daily price data.
     Returns error message if no data found.
     """
-    STOCK_INFO_PATH = "/uapi/domestic-stock/v1/quotations/inquire-daily-price"
-    async with httpx.AsyncClient() as client:
-        token = await KISAuthManager.get_access_token(client)
-        params = {
-            "fid_cond_mrkt_div_code": "J",
-            "fid_input_iscd": symbol,
-            "fid_org_adj_prc": adj,
-            "fid_period_div_code": "D",
-            "fid_begin_date": start_date,
-            "fid_end_date": end_date
-        }
-        response = await client.get(
-            f"{KISAuthManager.get_domain()}{STOCK_INFO_PATH}",
-            headers={
-                "content-type": KISAuthManager.CONTENT_TYPE,
-                "authorization": f"{KISAuthManager.AUTH_TYPE} {token}",
-                "appkey": os.environ["KIS_APP_KEY"],
-                "appsecret": os.environ["KIS_APP_SECRET"],
-                "tr_id": KISAuthManager.get_tr_id("stock_info")
-            },
-            params=params
-        )
-        if response.status_code != 200:
-            raise Exception(f"Failed to get daily price: {response.text}")
-        data = response.json()
-        # 일별 데이터에서 진짜 핵심 컬럼만 추출
-        core_keys = ["stck_bsop_date", "stck_oprc", "stck_hgpr", "stck_lwpr", "stck_clpr"]
-        filtered_output = [
-            {key: item.get(key) for key in core_keys}
-            for item in data.get("output", [])
-        ]
-        return filtered_output
+    data = await _kis_get(TR_STOCK_INFO, STOCK_INFO_PATH, stream=True, params={
+        "fid_cond_mrkt_div_code": "J",
+        "fid_input_iscd": symbol,
+        "fid_org_adj_prc": adj,
+        "fid_period_div_code": "D",
+        "fid_begin_date": start_date,
+        "fid_end_date": end_date
+    })
+    # 일별 데이터에서 진짜 핵심 컬럼만 추출
+    return [
+        _project(item, DAILY_PRICE_KEYS, DAILY_PRICE_GETTER)
+        for item in data.get("output", [])
+    ]
 
 if __name__ == "__main__":
+    # uvloop이 설치된 환경(Windows 제외)에서는 libuv 기반 이벤트 루프 사용
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
     mcp.run()
\ No newline at end of file